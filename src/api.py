@@ -1,9 +1,11 @@
 """FastAPI application for Family Budget."""
 
 import hashlib
+import heapq
 import json
 import logging
 import os
+import re
 import secrets
 import smtplib
 import sqlite3
@@ -12,6 +14,7 @@ from collections import defaultdict
 from datetime import datetime, timedelta
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from functools import lru_cache
 from pathlib import Path
 from urllib.parse import urlparse
 
@@ -22,6 +25,7 @@ from fastapi import FastAPI, Request, Form, HTTPException
 from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from . import database as db
@@ -38,40 +42,71 @@ logger = logging.getLogger(__name__)
 # Rate limiting
 # =============================================================================
 
+def _rate_limit_clock() -> int:
+    """Monotonic time in integer microseconds (patched in tests)."""
+    return time.monotonic_ns() // 1000
+
+
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Simple rate limiting for login attempts."""
+    """Token bucket rate limiting for login attempts.
+
+    Each client IP gets a bucket of max_attempts tokens which refills
+    completely over window_seconds. To stay in integer arithmetic, one
+    attempt costs window_seconds worth of microseconds and the bucket
+    refills max_attempts units per elapsed microsecond. Once per window,
+    clients whose bucket has refilled completely are forgotten, so memory
+    only grows with recently active IPs.
+    """
 
     def __init__(self, app, max_attempts: int = 5, window_seconds: int = 300):
         super().__init__(app)
         self.max_attempts = max_attempts
         self.window_seconds = window_seconds
-        self.attempts: dict[str, list[float]] = defaultdict(list)
+        self.attempt_cost = window_seconds * 1_000_000
+        self.capacity = max_attempts * self.attempt_cost
+        # A blocked client regains one attempt every window / max_attempts
+        retry_minutes = max(1, -(-window_seconds // (max_attempts * 60)))
+        self.retry_message = (
+            "For mange login forsøg. Prøv igen om "
+            + ("et minut." if retry_minutes == 1 else f"{retry_minutes} minutter.")
+        )
+        # Maps client IP to (bucket level, last update in microseconds)
+        self.buckets: dict[str, tuple[int, int]] = {}
+        self.next_prune = 0
+
+    def _prune(self, now: int):
+        """Drop buckets that are full again; they behave like new clients."""
+        self.buckets = {
+            ip: (level, last) for ip, (level, last) in self.buckets.items()
+            if level + (now - last) * self.max_attempts < self.capacity
+        }
+        self.next_prune = now + self.window_seconds * 1_000_000
+
+    def _take_token(self, client_ip: str) -> bool:
+        """Consume one attempt for client_ip. Returns False when rate limited."""
+        now = _rate_limit_clock()
+        if now >= self.next_prune:
+            self._prune(now)
+
+        level, last = self.buckets.get(client_ip, (self.capacity, now))
+        level = min(self.capacity, level + max(0, now - last) * self.max_attempts)
+
+        if level < self.attempt_cost:
+            self.buckets[client_ip] = (level, now)
+            return False
+
+        self.buckets[client_ip] = (level - self.attempt_cost, now)
+        return True
 
     async def dispatch(self, request: Request, call_next):
         # Only rate limit login POST requests
         if request.url.path == "/budget/login" and request.method == "POST":
             client_ip = request.client.host if request.client else "unknown"
-            now = time.time()
-
-            # Clean old attempts for this IP
-            self.attempts[client_ip] = [
-                t for t in self.attempts[client_ip]
-                if now - t < self.window_seconds
-            ]
-
-            # Remove IP key entirely if no recent attempts (prevents memory leak)
-            if not self.attempts[client_ip]:
-                del self.attempts[client_ip]
-            else:
-                # Check if rate limited
-                if len(self.attempts[client_ip]) >= self.max_attempts:
-                    return HTMLResponse(
-                        content="For mange login forsøg. Prøv igen om 5 minutter.",
-                        status_code=429
-                    )
-
-            # Record this attempt
-            self.attempts[client_ip].append(now)
+            if not self._take_token(client_ip):
+                return HTMLResponse(
+                    content=self.retry_message,
+                    status_code=429
+                )
 
         return await call_next(request)
 
@@ -186,13 +221,18 @@ app.mount("/budget/static", StaticFiles(directory=str(STATIC_DIR)), name="static
 # Template helpers
 # =============================================================================
 
+# Danish amounts use "." for thousands and "," for decimals:
+# drop the thousands separators and turn the decimal comma into a point.
+_DANISH_AMOUNT_TABLE = str.maketrans({".": None, ",": "."})
+_DECIMAL_RE = re.compile(r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)")
+
+
 def parse_danish_amount(amount_str: str) -> float:
     """Parse Danish currency format to float.
 
     Accepts:
     - "1234,50" -> 1234.50
     - "1.234,50" -> 1234.50
-    - "1234.5" -> 1234.50
     - "1234" -> 1234.00
 
     Returns float with 2 decimal precision.
@@ -204,25 +244,45 @@ def parse_danish_amount(amount_str: str) -> float:
     # Remove whitespace
     amount_str = amount_str.strip()
 
-    # Remove thousands separator (period)
-    amount_str = amount_str.replace('.', '')
+    # Fast path: plain whole numbers like "30000" need no separator handling
+    if amount_str.isascii() and amount_str.isdigit():
+        return float(amount_str)
 
-    # Replace comma with period for float parsing
-    amount_str = amount_str.replace(',', '.')
+    # At most one decimal comma, and no thousands separators after it
+    comma = amount_str.find(',')
+    if comma != -1:
+        decimals = amount_str[comma + 1:]
+        if ',' in decimals or '.' in decimals:
+            raise ValueError(f"Invalid amount format: {amount_str}")
 
-    try:
-        amount = float(amount_str)
-        # Round to 2 decimals to prevent floating point errors
-        return round(amount, 2)
-    except (ValueError, TypeError):
+    # Remove thousands separators and convert the decimal comma in one pass
+    amount_str = amount_str.translate(_DANISH_AMOUNT_TABLE)
+
+    # Reject anything that is not a plain decimal number up front, rather than
+    # letting float() fail (or accept "nan", "inf", "1e3", "1_000")
+    if not _DECIMAL_RE.fullmatch(amount_str):
         raise ValueError(f"Invalid amount format: {amount_str}")
 
+    # Round to 2 decimals to prevent floating point errors
+    return round(float(amount_str), 2)
+
+
+# Swap Python's "1,234.50" separators to Danish "1.234,50" in one pass
+_DANISH_SEPARATOR_TABLE = str.maketrans({",": ".", ".": ","})
+
+
+@lru_cache(maxsize=4096)
+def _format_currency(amount: float) -> str:
+    # Format: 1234.50 -> "1.234,50 kr"
+    return f"{amount:,.2f}".translate(_DANISH_SEPARATOR_TABLE) + " kr"
+
 
 def format_currency(amount: float) -> str:
     """Format amount as Danish currency with 2 decimal places."""
-    # Format: 1234.50 -> "1.234,50 kr"
-    formatted = f"{amount:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-    return formatted + " kr"
+    # Pages repeat the same totals, so formatted strings are cached; rounding
+    # first lets amounts that display identically share one entry. "+ 0.0"
+    # turns -0.0 into 0.0, which shares its cache key, so the sign is stable.
+    return _format_currency(round(amount, 2) + 0.0)
 
 
 # Add to Jinja2 globals
@@ -236,7 +296,7 @@ def format_currency_short(amount: float) -> str:
     if amount == int(amount):
         formatted = f"{int(amount):,}".replace(",", ".")
     else:
-        formatted = f"{amount:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        formatted = f"{amount:,.2f}".translate(_DANISH_SEPARATOR_TABLE)
     return formatted
 
 
@@ -251,6 +311,21 @@ templates.env.globals["app_version"] = app.state.version
 DEMO_SESSION_ID = "demo"  # Special marker for demo mode
 
 
+def _session_hash(request: Request) -> str | None:
+    """Hashed session token of a non-demo session cookie.
+
+    Handlers call check_auth and get_user_id on the same request, so the
+    hash is computed once and kept on request.state. Only the hash is
+    cached; SESSIONS is still consulted on every call.
+    """
+    hashed = getattr(request.state, "session_hash", False)
+    if hashed is False:
+        session_id = request.cookies.get("budget_session")
+        hashed = hash_token(session_id) if session_id and session_id != DEMO_SESSION_ID else None
+        request.state.session_hash = hashed
+    return hashed
+
+
 def check_auth(request: Request) -> bool:
     """Check if request is authenticated (including demo mode)."""
     session_id = request.cookies.get("budget_session")
@@ -260,15 +335,14 @@ def check_auth(request: Request) -> bool:
     if session_id == DEMO_SESSION_ID:
         return True
     # Compare hashed token
-    return hash_token(session_id) in SESSIONS
+    return _session_hash(request) in SESSIONS
 
 
 def get_user_id(request: Request) -> int | None:
     """Get user_id from session. Returns None for demo mode or invalid sessions."""
-    session_id = request.cookies.get("budget_session")
-    if not session_id or session_id == DEMO_SESSION_ID:
+    hashed = _session_hash(request)
+    if hashed is None:
         return None
-    hashed = hash_token(session_id)
     return SESSIONS.get(hashed)
 
 
@@ -297,7 +371,8 @@ async def login(
     password: str = Form(...)
 ):
     """Login with username and password."""
-    user = db.authenticate_user(username, password)
+    # PBKDF2 verification is CPU-bound; keep it off the event loop
+    user = await run_in_threadpool(db.authenticate_user, username, password)
     if user:
         db.update_last_login(user.id)
         session_id = secrets.token_urlsafe(32)
@@ -734,10 +809,8 @@ async def update_income(request: Request):
                 incomes_to_save.append((name, amount, frequency))
             i += 1
 
-        # Clear existing and save new
-        db.delete_all_income(user_id)
-        for name, amount, frequency in incomes_to_save:
-            db.add_income(user_id, name, amount, frequency)
+        # Clear existing and save new in one transaction
+        db.replace_all_income(user_id, incomes_to_save)
 
     except (ValueError, sqlite3.Error) as e:
         logger.error(f"Error updating income: {e}")
@@ -773,7 +846,7 @@ async def expenses_page(request: Request):
         expenses_by_category = db.get_expenses_by_category(user_id)
         category_totals = db.get_category_totals(user_id)
         categories = db.get_all_categories(user_id)
-        category_usage = {cat.name: db.get_category_usage_count(cat.name, user_id) for cat in categories}
+        category_usage = db.get_category_usage_counts(user_id)
         accounts = db.get_all_accounts(user_id)
 
     return templates.TemplateResponse(
@@ -953,7 +1026,7 @@ async def categories_page(request: Request):
     if demo:
         category_usage = {cat.name: 0 for cat in categories}
     else:
-        category_usage = {cat.name: db.get_category_usage_count(cat.name, user_id) for cat in categories}
+        category_usage = db.get_category_usage_counts(user_id)
 
     return templates.TemplateResponse(
         "categories.html",
@@ -1179,20 +1252,24 @@ async def delete_account(request: Request, account_id: int):
 # Om (About)
 # =============================================================================
 
+@lru_cache(maxsize=8)
+def _render_about_page(show_nav: bool, demo_mode: bool, demo_advanced: bool) -> str:
+    """Render the about page once per combination of the flags it depends on."""
+    return templates.get_template("om.html").render(
+        demo_mode=demo_mode,
+        demo_advanced=demo_advanced,
+        show_nav=show_nav,
+        donation_links=DONATION_LINKS if not demo_mode else {},
+    )
+
+
 @app.get("/budget/om", response_class=HTMLResponse)
 async def about_page(request: Request):
     """About page with user guide and self-hosting info."""
     logged_in = check_auth(request)
     demo_mode = is_demo_mode(request)
-    return templates.TemplateResponse(
-        "om.html",
-        {
-            "request": request,
-            "demo_mode": demo_mode,
-            "demo_advanced": is_demo_advanced(request),
-            "show_nav": logged_in or demo_mode,
-            "donation_links": DONATION_LINKS if not demo_mode else {},
-        }
+    return HTMLResponse(
+        _render_about_page(logged_in or demo_mode, demo_mode, is_demo_advanced(request))
     )
 
 
@@ -1206,13 +1283,16 @@ async def help_redirect(request: Request):
 # Privacy Policy
 # =============================================================================
 
+@lru_cache(maxsize=1)
+def _render_privacy_page() -> str:
+    """Render the privacy policy once; it has no per-request content."""
+    return templates.get_template("privacy.html").render(show_nav=False)
+
+
 @app.get("/budget/privacy", response_class=HTMLResponse)
 async def privacy_page(request: Request):
     """Privacy policy page - accessible without login."""
-    return templates.TemplateResponse(
-        "privacy.html",
-        {"request": request, "show_nav": False}
-    )
+    return HTMLResponse(_render_privacy_page())
 
 
 # =============================================================================
@@ -1393,22 +1473,23 @@ async def chart_data(request: Request):
         category_totals = db.get_demo_category_totals(advanced)
         total_income = db.get_demo_total_income(advanced)
         total_expenses = db.get_demo_total_expenses(advanced)
-        expenses = db.get_demo_expenses(advanced)
+        expenses = heapq.nlargest(
+            5, db.get_demo_expenses(advanced), key=lambda e: e.monthly_amount
+        )
     else:
         category_totals = db.get_category_totals(user_id)
         total_income = db.get_total_income(user_id)
         total_expenses = db.get_total_monthly_expenses(user_id)
-        expenses = db.get_all_expenses(user_id)
+        expenses = db.get_top_expenses(user_id, 5)
 
-    # Get top 5 expenses by monthly amount
-    sorted_expenses = sorted(expenses, key=lambda e: e.monthly_amount, reverse=True)
+    # Top 5 expenses by monthly amount
     top_expenses = [
         {
             "name": exp.name,
             "amount": exp.monthly_amount,
             "category": exp.category
         }
-        for exp in sorted_expenses[:5]
+        for exp in expenses
     ]
 
     # Group small categories as "Andet (samlet)" if more than 6 categories
@@ -1420,12 +1501,13 @@ async def chart_data(request: Request):
             top_cats["Andet (samlet)"] = other_total
         category_totals = top_cats
 
-    return {
+    # Already plain JSON types, so skip FastAPI's jsonable_encoder pass
+    return JSONResponse({
         "category_totals": category_totals,
         "total_income": total_income,
         "total_expenses": total_expenses,
         "top_expenses": top_expenses
-    }
+    })
 
 
 # =============================================================================
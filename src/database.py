@@ -5,6 +5,7 @@ import json
 import os
 import secrets
 import sqlite3
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass
@@ -239,8 +240,12 @@ class PasswordResetToken:
 
 
 def get_connection() -> sqlite3.Connection:
-    """Get database connection."""
-    conn = sqlite3.connect(DB_PATH)
+    """Get database connection.
+
+    DB_PATH may also be an SQLite URI such as
+    "file:budget?mode=memory&cache=shared" (used by the test suite).
+    """
+    conn = sqlite3.connect(DB_PATH, uri=str(DB_PATH).startswith("file:"))
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -428,11 +433,10 @@ def init_db():
     cur.execute("CREATE INDEX IF NOT EXISTS idx_accounts_user ON accounts(user_id, name)")
 
     # Insert default categories for demo user (user_id = 0)
-    for name, icon in DEFAULT_CATEGORIES:
-        cur.execute(
-            "INSERT OR IGNORE INTO categories (user_id, name, icon) VALUES (?, ?, ?)",
-            (0, name, icon)
-        )
+    cur.executemany(
+        "INSERT OR IGNORE INTO categories (user_id, name, icon) VALUES (?, ?, ?)",
+        [(0, name, icon) for name, icon in DEFAULT_CATEGORIES]
+    )
 
     conn.commit()
     conn.close()
@@ -515,6 +519,26 @@ def delete_all_income(user_id: int):
     conn.close()
 
 
+def replace_all_income(user_id: int, incomes: list[tuple[str, float, str]]):
+    """Replace a user's income entries with (person, amount, frequency) rows.
+
+    Runs as a single transaction, so a failure leaves the old entries intact.
+    A repeated person keeps the last amount and frequency given.
+    """
+    conn = get_connection()
+    try:
+        with conn:
+            conn.execute("DELETE FROM income WHERE user_id = ?", (user_id,))
+            conn.executemany(
+                """INSERT INTO income (user_id, person, amount, frequency)
+                   VALUES (?, ?, ?, ?)
+                   ON CONFLICT(user_id, person) DO UPDATE SET amount = excluded.amount, frequency = excluded.frequency""",
+                [(user_id, person, amount, frequency) for person, amount, frequency in incomes]
+            )
+    finally:
+        conn.close()
+
+
 # =============================================================================
 # Expense operations
 # =============================================================================
@@ -572,6 +596,21 @@ def add_expense(user_id: int, name: str, category: str, amount: float, frequency
     return expense_id
 
 
+def add_expenses_bulk(user_id: int, expenses: list[tuple[str, str, float, str]]):
+    """Add several (name, category, amount, frequency) expenses in one transaction."""
+    conn = get_connection()
+    try:
+        with conn:
+            conn.executemany(
+                """INSERT INTO expenses (user_id, name, category, amount, frequency)
+                   VALUES (?, ?, ?, ?, ?)""",
+                [(user_id, name, category, amount, frequency)
+                 for name, category, amount, frequency in expenses]
+            )
+    finally:
+        conn.close()
+
+
 def update_expense(expense_id: int, user_id: int, name: str, category: str, amount: float, frequency: str, account: str = None, months: list[int] = None):
     """Update an existing expense for a user."""
     conn = get_connection()
@@ -627,17 +666,51 @@ def get_expenses_by_category(user_id: int) -> dict[str, list[Expense]]:
     return grouped
 
 
+# Per-row monthly equivalent, unrounded. Only used for ordering: SQLite's
+# ROUND differs from Python's round() on half-cent floats, so displayed
+# amounts always come from Expense.monthly_amount.
+_EXPENSE_MONTHLY_SQL = """
+    CASE
+        WHEN frequency = 'quarterly' THEN amount / 3.0
+        WHEN frequency = 'semi-annual' THEN amount / 6.0
+        WHEN frequency = 'yearly' THEN amount / 12.0
+        ELSE amount
+    END
+"""
+
+
 def get_category_totals(user_id: int) -> dict[str, float]:
-    """Get total monthly amount per category for a user."""
-    expenses = get_all_expenses(user_id)
+    """Get total monthly amount per category for a user.
+
+    Sums the rounded per-expense amounts, so totals match the rows shown.
+    """
     totals = {}
-    for exp in expenses:
-        if exp.category not in totals:
-            totals[exp.category] = 0
-        totals[exp.category] += exp.monthly_amount
+    for exp in get_all_expenses(user_id):
+        totals[exp.category] = totals.get(exp.category, 0) + exp.monthly_amount
     return totals
 
 
+def get_top_expenses(user_id: int, limit: int = 5) -> list[Expense]:
+    """Get the user's largest expenses by monthly amount, largest first."""
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(f"""
+        SELECT id, user_id, name, category, amount, frequency, account, months
+        FROM expenses
+        WHERE user_id = ?
+        ORDER BY {_EXPENSE_MONTHLY_SQL} DESC, category, name
+        LIMIT ?
+    """, (user_id, limit))
+    rows = cur.fetchall()
+    conn.close()
+    expenses = []
+    for row in rows:
+        d = dict(row)
+        d['months'] = json.loads(d['months']) if d['months'] else None
+        expenses.append(Expense(**d))
+    return expenses
+
+
 # =============================================================================
 # Category operations
 # =============================================================================
@@ -771,15 +844,35 @@ def get_category_usage_count(category_name: str, user_id: int) -> int:
     return count
 
 
+def get_category_usage_counts(user_id: int) -> dict[str, int]:
+    """Get the number of expenses using each of a user's categories.
+
+    Same matching as get_category_usage_count, but for every category in
+    one query instead of one query per category.
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute(
+        """SELECT c.name, COUNT(e.id) FROM categories c
+           LEFT JOIN expenses e
+             ON e.user_id = c.user_id AND (e.category = c.name OR e.category_id = c.id)
+           WHERE c.user_id = ?
+           GROUP BY c.id""",
+        (user_id,)
+    )
+    counts = {name: count for name, count in cur.fetchall()}
+    conn.close()
+    return counts
+
+
 def ensure_default_categories(user_id: int):
     """Create default categories for a user if they don't exist."""
     conn = get_connection()
     cur = conn.cursor()
-    for name, icon in DEFAULT_CATEGORIES:
-        cur.execute(
-            "INSERT OR IGNORE INTO categories (user_id, name, icon) VALUES (?, ?, ?)",
-            (user_id, name, icon)
-        )
+    cur.executemany(
+        "INSERT OR IGNORE INTO categories (user_id, name, icon) VALUES (?, ?, ?)",
+        [(user_id, name, icon) for name, icon in DEFAULT_CATEGORIES]
+    )
     conn.commit()
     conn.close()
 
@@ -976,12 +1069,11 @@ def create_user(
 
     If email is provided, only its hash is stored for password reset lookup.
     The actual email is never stored.
-
-    Uses try/except for IntegrityError to handle race conditions where
-    another process might insert the same username between check and insert.
     """
-    conn = get_connection()
-    cur = conn.cursor()
+    # Skip the deliberately slow hash for a taken username (case-insensitive
+    # via the column collation); _insert_user still guards against races
+    if get_user_by_username(username):
+        return None
 
     # Hash password
     password_hash, salt = hash_password(password)
@@ -989,6 +1081,25 @@ def create_user(
     # Hash email if provided (only hash is stored, not the email itself)
     email_hash_val = hash_email(email) if email else None
 
+    return _insert_user(username, password_hash, salt, email_hash_val)
+
+
+def _insert_user(
+    username: str,
+    password_hash: str,
+    salt: str,
+    email_hash_val: str = None
+) -> Optional[int]:
+    """Insert a user row with an already computed password hash.
+
+    Returns user ID or None if username exists.
+
+    Uses try/except for IntegrityError to handle race conditions where
+    another process might insert the same username between check and insert.
+    """
+    conn = get_connection()
+    cur = conn.cursor()
+
     try:
         cur.execute(
             """INSERT INTO users
@@ -1236,32 +1347,57 @@ def get_yearly_overview(user_id: int) -> dict:
     }
 
 
+# Demo data is static, so each variant is built once and callers get a fresh
+# list (or dict) they are free to modify.
+
+@lru_cache(maxsize=4)
+def _demo_income(advanced: bool) -> tuple[Income, ...]:
+    source = DEMO_INCOME_ADVANCED if advanced else DEMO_INCOME
+    return tuple(Income(id=i+1, user_id=0, person=person, amount=amount, frequency=freq, months=months)
+                 for i, (person, amount, freq, months) in enumerate(source))
+
+
+@lru_cache(maxsize=4)
+def _demo_expenses(advanced: bool) -> tuple[Expense, ...]:
+    if advanced:
+        return tuple(Expense(id=i+1, user_id=0, name=name, category=cat, amount=amount, frequency=freq, account=acct, months=months)
+                     for i, (name, cat, amount, freq, acct, months) in enumerate(DEMO_EXPENSES_ADVANCED))
+    return tuple(Expense(id=i+1, user_id=0, name=name, category=cat, amount=amount, frequency=freq, account=None, months=months)
+                 for i, (name, cat, amount, freq, months) in enumerate(DEMO_EXPENSES))
+
+
+@lru_cache(maxsize=4)
+def _demo_account_totals(advanced: bool) -> dict[str, float]:
+    if not advanced:
+        return {}
+    totals = {}
+    for exp in _demo_expenses(True):
+        if exp.account:
+            if exp.account not in totals:
+                totals[exp.account] = 0
+            totals[exp.account] += exp.monthly_amount
+    return totals
+
+
 def get_demo_income(advanced: bool = False) -> list[Income]:
     """Get demo income data."""
-    source = DEMO_INCOME_ADVANCED if advanced else DEMO_INCOME
-    return [Income(id=i+1, user_id=0, person=person, amount=amount, frequency=freq, months=months)
-            for i, (person, amount, freq, months) in enumerate(source)]
+    return list(_demo_income(advanced))
 
 
 def get_demo_total_income(advanced: bool = False) -> float:
     """Get total demo income (converted to monthly equivalent)."""
-    return sum(inc.monthly_amount for inc in get_demo_income(advanced))
+    return sum(inc.monthly_amount for inc in _demo_income(advanced))
 
 
 def get_demo_expenses(advanced: bool = False) -> list[Expense]:
     """Get demo expense data."""
-    if advanced:
-        return [Expense(id=i+1, user_id=0, name=name, category=cat, amount=amount, frequency=freq, account=acct, months=months)
-                for i, (name, cat, amount, freq, acct, months) in enumerate(DEMO_EXPENSES_ADVANCED)]
-    return [Expense(id=i+1, user_id=0, name=name, category=cat, amount=amount, frequency=freq, account=None, months=months)
-            for i, (name, cat, amount, freq, months) in enumerate(DEMO_EXPENSES)]
+    return list(_demo_expenses(advanced))
 
 
 def get_demo_expenses_by_category(advanced: bool = False) -> dict[str, list[Expense]]:
     """Get demo expenses grouped by category."""
-    expenses = get_demo_expenses(advanced)
     grouped = {}
-    for exp in expenses:
+    for exp in _demo_expenses(advanced):
         if exp.category not in grouped:
             grouped[exp.category] = []
         grouped[exp.category].append(exp)
@@ -1270,9 +1406,8 @@ def get_demo_expenses_by_category(advanced: bool = False) -> dict[str, list[Expe
 
 def get_demo_category_totals(advanced: bool = False) -> dict[str, float]:
     """Get demo total monthly amount per category."""
-    expenses = get_demo_expenses(advanced)
     totals = {}
-    for exp in expenses:
+    for exp in _demo_expenses(advanced):
         if exp.category not in totals:
             totals[exp.category] = 0
         totals[exp.category] += exp.monthly_amount
@@ -1281,21 +1416,12 @@ def get_demo_category_totals(advanced: bool = False) -> dict[str, float]:
 
 def get_demo_total_expenses(advanced: bool = False) -> float:
     """Get demo total monthly expenses."""
-    return sum(exp.monthly_amount for exp in get_demo_expenses(advanced))
+    return sum(exp.monthly_amount for exp in _demo_expenses(advanced))
 
 
 def get_demo_account_totals(advanced: bool = False) -> dict[str, float]:
     """Get demo account totals (monthly equivalent)."""
-    if not advanced:
-        return {}
-    expenses = get_demo_expenses(advanced=True)
-    totals = {}
-    for exp in expenses:
-        if exp.account:
-            if exp.account not in totals:
-                totals[exp.account] = 0
-            totals[exp.account] += exp.monthly_amount
-    return totals
+    return dict(_demo_account_totals(advanced))
 
 
 def get_demo_accounts(advanced: bool = False) -> list[Account]:
@@ -1,32 +1,154 @@
 """Pytest fixtures for Family Budget tests."""
 
+import os
 import secrets
+import shutil
+import sqlite3
 import tempfile
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
 
+import httpx
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
 
+# Give every pytest-xdist worker its own scratch directory. This must run
+# before src is imported, because src.api calls init_db() at import time
+# (which also creates the directory).
+WORKER_ID = os.environ.get("PYTEST_XDIST_WORKER", "main")
+SCRATCH_DIR = Path(tempfile.gettempdir()) / f"family-budget-{WORKER_ID}-{os.getpid()}"
+os.environ["BUDGET_DB_PATH"] = str(SCRATCH_DIR / "budget.db")
 
-@pytest.fixture(scope="function")
-def temp_db():
-    """Create a temporary database for testing.
+# Resolve src.__version__ from the environment instead of reading VERSION.
+os.environ.setdefault("APP_VERSION", "0.0.0-test")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _isolated_worker_files():
+    """Keep session persistence inside the worker's scratch directory."""
+    from src import api
+
+    api.SESSIONS_FILE = SCRATCH_DIR / "sessions.json"
+
+    yield
+
+    shutil.rmtree(SCRATCH_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _cheap_password_hashing():
+    """Lower the PBKDF2 cost for the whole session.
+
+    Production cost (600k iterations) makes every create_user and login
+    take a noticeable fraction of a second; tests only need the code path.
+    hash_password reads the module global at call time, and this runs
+    before any session fixture hashes a password.
+    """
+    from src import database as db
+
+    db.PBKDF2_ITERATIONS = 1000
 
-    Each test gets a fresh database to ensure isolation.
+
+@pytest.fixture(scope="session", autouse=True)
+def _static_templates():
+    """Stop Jinja2 from stat-ing template files on every render.
+
+    Templates never change during a test run, so compiled templates can
+    be served straight from the environment's cache (400 entries by
+    default, far more than the app has).
     """
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-        temp_path = Path(f.name)
+    from src import api
+
+    api.templates.env.auto_reload = False
 
-    # Re-initialize database with the temp path
+
+@contextmanager
+def _database_at(path: Path):
+    """Temporarily point the database module at another file."""
     from src import database as db
-    db.DB_PATH = temp_path
-    db.init_db()
 
-    yield temp_path
+    original_path = db.DB_PATH
+    db.DB_PATH = path
+    try:
+        yield db
+    finally:
+        db.DB_PATH = original_path
+
+
+@pytest.fixture(scope="session")
+def _template_db():
+    """Initialise the schema once; every test starts from a copy of it."""
+    path = SCRATCH_DIR / "template.db"
+    with _database_at(path) as db:
+        db.init_db()
+    return path
 
-    # Cleanup
-    if temp_path.exists():
-        temp_path.unlink()
+
+@pytest.fixture(scope="session")
+def _template_conn(_template_db):
+    """Private in-memory copy of the template that per-test databases are
+    restored from, so no test has to read the template file."""
+    conn = sqlite3.connect(":memory:")
+    _restore_db(_template_db, conn)
+    yield conn
+    conn.close()
+
+
+@contextmanager
+def _memory_db(snapshot: Path | sqlite3.Connection):
+    """Yield the URI of a private shared-cache memory copy of snapshot.
+
+    The anchor connection keeps the database alive while the database
+    module opens and closes its own connections.
+    """
+    uri = f"file:budget-{WORKER_ID}-{uuid.uuid4().hex}?mode=memory&cache=shared"
+    anchor = sqlite3.connect(uri, uri=True)
+    try:
+        _restore_db(snapshot, anchor)
+        yield uri
+    finally:
+        anchor.close()
+
+
+@pytest.fixture(scope="function")
+def temp_db(_template_conn):
+    """Create a temporary in-memory database for testing.
+
+    Each test gets its own copy of the initialised template, restored with
+    the SQLite backup API.
+    """
+    with _memory_db(_template_conn) as uri:
+        from src import database as db
+        db.DB_PATH = uri
+
+        yield uri
+
+
+def _restore_db(snapshot: Path | sqlite3.Connection, target: sqlite3.Connection):
+    """Copy a snapshot database (file or open connection) into target."""
+    if isinstance(snapshot, sqlite3.Connection):
+        snapshot.backup(target)
+        return
+    source = sqlite3.connect(snapshot)
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+
+
+@pytest.fixture
+def restore_db(temp_db):
+    """Replace the current test database with the contents of a snapshot file."""
+    def _restore(snapshot: Path):
+        target = sqlite3.connect(temp_db, uri=True)
+        try:
+            _restore_db(snapshot, target)
+        finally:
+            target.close()
+
+    return _restore
 
 
 @pytest.fixture(scope="function")
@@ -37,35 +159,154 @@ def db_module(temp_db):
     return db
 
 
+@pytest.fixture(scope="session")
+def _raw_client():
+    """Single TestClient shared by the whole session.
+
+    The app object never changes between tests, so there is no need to
+    build a new transport and httpx client for every test.
+    """
+    from src import api
+
+    with TestClient(api.app) as c:
+        yield c
+
+
 @pytest.fixture(scope="function")
-def client(temp_db):
-    """Create a test client with fresh database and sessions."""
+def client(temp_db, _raw_client):
+    """Create a test client with fresh database, cookies and sessions."""
     from src import database as db
     from src import api
 
     # Reset database path
     db.DB_PATH = temp_db
 
-    # Clear sessions for fresh state
+    # Clear sessions and cookies for fresh state
     api.SESSIONS.clear()
+    _raw_client.cookies.clear()
 
-    # Create test client
-    with TestClient(api.app) as c:
+    yield _raw_client
+
+    _raw_client.cookies.clear()
+    _raw_client.follow_redirects = True
+    _raw_client.__dict__.pop("user_id", None)
+
+
+@pytest.fixture
+def no_redirects(client):
+    """Make the test client return redirects instead of following them."""
+    client.follow_redirects = False
+
+
+@pytest.fixture(scope="module")
+def _read_only_db(_template_conn):
+    """Database shared by the read-only tests of one module."""
+    with _memory_db(_template_conn) as uri:
+        yield uri
+
+
+@pytest.fixture
+def client_ro(_read_only_db, _raw_client):
+    """Test client for tests that only read.
+
+    Unlike client, it skips the per-test database copy and reuses one
+    database for the whole module, so tests using it must not write.
+    """
+    from src import database as db
+    from src import api
+
+    db.DB_PATH = _read_only_db
+    api.SESSIONS.clear()
+    _raw_client.cookies.clear()
+
+    yield _raw_client
+
+    _raw_client.cookies.clear()
+
+
+@pytest_asyncio.fixture
+async def async_client(temp_db):
+    """Async client that drives the ASGI app directly on the test's event loop.
+
+    Unlike TestClient there is no sync-to-async portal thread per request,
+    which suits tests that only POST a form and inspect the response.
+    """
+    from src import database as db
+    from src import api
+
+    db.DB_PATH = temp_db
+    api.SESSIONS.clear()
+
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as c:
         yield c
 
 
+@pytest.fixture(scope="session")
+def _auth_credentials():
+    """Hash the shared test user's password once per session.
+
+    PBKDF2 is deliberately slow, so the hash is computed a single time
+    and inserted directly for every test that needs a logged-in user.
+    """
+    from src import database as db
+
+    password_hash, salt = db.hash_password("testpass123")
+    return "testuser", password_hash, salt
+
+
 @pytest.fixture
-def authenticated_client(client, db_module):
+def make_user(db_module, _auth_credentials):
+    """Factory that inserts users with the pre-computed test password hash.
+
+    Users created this way log in with "testpass123". Use it wherever a
+    test only needs a user row and does not exercise password hashing.
+    """
+    _, password_hash, salt = _auth_credentials
+
+    def _make_user(username: str) -> int:
+        return db_module._insert_user(username, password_hash, salt)
+
+    return _make_user
+
+
+@pytest.fixture(scope="session")
+def _auth_template_db(_template_db, _auth_credentials):
+    """Template database that already contains the authenticated test user."""
+    username, password_hash, salt = _auth_credentials
+    path = SCRATCH_DIR / "auth_template.db"
+    shutil.copyfile(_template_db, path)
+    with _database_at(path) as db:
+        user_id = db._insert_user(username, password_hash, salt)
+    return path, user_id
+
+
+@pytest.fixture(scope="session")
+def _reset_template_db(_template_db, _auth_credentials):
+    """Template database that contains the password reset tests' user."""
+    _, password_hash, salt = _auth_credentials
+    path = SCRATCH_DIR / "reset_template.db"
+    shutil.copyfile(_template_db, path)
+    with _database_at(path) as db:
+        user_id = db._insert_user("resetuser", password_hash, salt)
+    return path, user_id
+
+
+@pytest.fixture
+def authenticated_client(client, restore_db, _auth_template_db):
     """Test client with an authenticated session.
 
+    The test user is created once per session; each test starts from a
+    copy of the database that already contains it.
+
     Note: We manually create and register a session because
     the secure cookie flag prevents TestClient from storing
     cookies (it uses HTTP, not HTTPS).
     """
     from src import api
 
-    # Create a test user
-    user_id = db_module.create_user("testuser", "testpass123")
+    template_path, user_id = _auth_template_db
+    restore_db(template_path)
 
     # Create session manually (bypassing secure cookie issue)
     session_id = secrets.token_urlsafe(32)
@@ -78,3 +319,22 @@ def authenticated_client(client, db_module):
     client.user_id = user_id
 
     return client
+
+
+@pytest_asyncio.fixture
+async def authenticated_async_client(async_client, restore_db, _auth_template_db):
+    """Async counterpart of authenticated_client for write-path tests.
+
+    Redirects are not followed, matching httpx.AsyncClient's default.
+    """
+    from src import api
+
+    template_path, user_id = _auth_template_db
+    restore_db(template_path)
+
+    session_id = secrets.token_urlsafe(32)
+    api.SESSIONS[api.hash_token(session_id)] = user_id
+    async_client.cookies.set("budget_session", session_id)
+    async_client.user_id = user_id
+
+    return async_client
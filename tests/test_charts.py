@@ -1,6 +1,8 @@
 """Tests for chart data API endpoint."""
 
-import pytest
+# Demo session cookie, sent per request; test_api.py covers the /budget/demo
+# redirect that normally sets it
+_DEMO = {"Cookie": "budget_session=demo"}
 
 
 class TestChartDataEndpoint:
@@ -92,8 +94,9 @@ class TestChartDataEndpoint:
         """Top expenses should be limited to 5 items."""
         user_id = authenticated_client.user_id
 
-        for i in range(10):
-            db_module.add_expense(user_id, f"Expense {i}", "Andet", 100 * (i + 1), "monthly")
+        db_module.add_expenses_bulk(
+            user_id, [(f"Expense {i}", "Andet", 100 * (i + 1), "monthly") for i in range(10)]
+        )
 
         response = authenticated_client.get("/budget/api/chart-data")
         data = response.json()
@@ -119,17 +122,9 @@ class TestChartDataEndpoint:
 class TestChartDataDemoMode:
     """Tests for chart data in demo mode."""
 
-    def test_demo_mode_returns_demo_data(self, client):
+    def test_demo_mode_returns_demo_data(self, client_ro):
         """Demo mode should return demo data."""
-        # Enter demo mode - cookie is set on redirect response
-        demo_response = client.get("/budget/demo", follow_redirects=False)
-        assert demo_response.status_code == 303
-
-        # Get the demo cookie and set it manually
-        demo_cookie = demo_response.cookies.get("budget_session")
-        client.cookies.set("budget_session", demo_cookie)
-
-        response = client.get("/budget/api/chart-data")
+        response = client_ro.get("/budget/api/chart-data", headers=_DEMO)
         assert response.status_code == 200
 
         data = response.json()
@@ -139,27 +134,17 @@ class TestChartDataDemoMode:
         assert len(data["category_totals"]) > 0
         assert len(data["top_expenses"]) > 0
 
-    def test_demo_mode_income_value(self, client):
+    def test_demo_mode_income_value(self, client_ro):
         """Demo mode should return expected income total."""
-        # Enter demo mode
-        demo_response = client.get("/budget/demo", follow_redirects=False)
-        demo_cookie = demo_response.cookies.get("budget_session")
-        client.cookies.set("budget_session", demo_cookie)
-
-        response = client.get("/budget/api/chart-data")
+        response = client_ro.get("/budget/api/chart-data", headers=_DEMO)
         data = response.json()
 
         # Demo income: 28000 + 22000 + 30000/6 = 55000
         assert data["total_income"] == 55000
 
-    def test_demo_mode_has_categories(self, client):
+    def test_demo_mode_has_categories(self, client_ro):
         """Demo mode should have multiple expense categories."""
-        # Enter demo mode
-        demo_response = client.get("/budget/demo", follow_redirects=False)
-        demo_cookie = demo_response.cookies.get("budget_session")
-        client.cookies.set("budget_session", demo_cookie)
-
-        response = client.get("/budget/api/chart-data")
+        response = client_ro.get("/budget/api/chart-data", headers=_DEMO)
         data = response.json()
 
         # Demo data has various categories
@@ -177,8 +162,10 @@ class TestChartDataCategoryGrouping:
 
         # Add 8 different category expenses
         categories = ["Bolig", "Transport", "Mad", "Forsikring", "Abonnementer", "Børn", "Opsparing", "Andet"]
-        for i, cat in enumerate(categories):
-            db_module.add_expense(user_id, f"Expense {i}", cat, (i + 1) * 1000, "monthly")
+        db_module.add_expenses_bulk(
+            user_id,
+            [(f"Expense {i}", cat, (i + 1) * 1000, "monthly") for i, cat in enumerate(categories)]
+        )
 
         response = authenticated_client.get("/budget/api/chart-data")
         data = response.json()
@@ -192,8 +179,10 @@ class TestChartDataCategoryGrouping:
 
         # Add 6 different category expenses
         categories = ["Bolig", "Transport", "Mad", "Forsikring", "Abonnementer", "Børn"]
-        for i, cat in enumerate(categories):
-            db_module.add_expense(user_id, f"Expense {i}", cat, (i + 1) * 1000, "monthly")
+        db_module.add_expenses_bulk(
+            user_id,
+            [(f"Expense {i}", cat, (i + 1) * 1000, "monthly") for i, cat in enumerate(categories)]
+        )
 
         response = authenticated_client.get("/budget/api/chart-data")
         data = response.json()
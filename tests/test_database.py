@@ -53,16 +53,16 @@ class TestPasswordHashing:
 class TestIncomeOperations:
     """Tests for income CRUD operations."""
 
-    def test_get_all_income_empty_for_new_user(self, db_module):
+    def test_get_all_income_empty_for_new_user(self, db_module, make_user):
         """New user should have no income entries."""
-        user_id = db_module.create_user("incometest1", "testpass")
+        user_id = make_user("incometest1")
         incomes = db_module.get_all_income(user_id)
 
         assert len(incomes) == 0
 
-    def test_add_income(self, db_module):
+    def test_add_income(self, db_module, make_user):
         """add_income should create a new income entry."""
-        user_id = db_module.create_user("incometest2", "testpass")
+        user_id = make_user("incometest2")
         income_id = db_module.add_income(user_id, "Person 1", 30000)
 
         assert income_id is not None
@@ -73,9 +73,9 @@ class TestIncomeOperations:
         assert incomes[0].frequency == "monthly"
         assert incomes[0].monthly_amount == 30000
 
-    def test_add_income_with_frequency(self, db_module):
+    def test_add_income_with_frequency(self, db_module, make_user):
         """add_income should support different frequencies."""
-        user_id = db_module.create_user("incometest2a", "testpass")
+        user_id = make_user("incometest2a")
         db_module.add_income(user_id, "Quarterly Bonus", 9000, "quarterly")
 
         incomes = db_module.get_all_income(user_id)
@@ -83,20 +83,20 @@ class TestIncomeOperations:
         assert incomes[0].frequency == "quarterly"
         assert incomes[0].monthly_amount == 3000  # 9000 / 3
 
-    def test_update_income(self, db_module):
+    def test_update_income(self, db_module, make_user):
         """update_income should change the amount or create if not exists."""
-        user_id = db_module.create_user("incometest3", "testpass")
+        user_id = make_user("incometest3")
         db_module.update_income(user_id, "Alice", 35000)
 
-        incomes = db_module.get_all_income(user_id)
-        alice_income = next((i for i in incomes if i.person == "Alice"), None)
+        by_person = {i.person: i for i in db_module.get_all_income(user_id)}
+        alice_income = by_person.get("Alice")
         assert alice_income is not None
         assert alice_income.amount == 35000
         assert alice_income.monthly_amount == 35000
 
-    def test_update_income_with_frequency(self, db_module):
+    def test_update_income_with_frequency(self, db_module, make_user):
         """update_income should handle frequency."""
-        user_id = db_module.create_user("incometest3a", "testpass")
+        user_id = make_user("incometest3a")
         db_module.update_income(user_id, "Yearly Dividend", 12000, "yearly")
 
         incomes = db_module.get_all_income(user_id)
@@ -105,35 +105,31 @@ class TestIncomeOperations:
         assert inc.frequency == "yearly"
         assert inc.monthly_amount == 1000  # 12000 / 12
 
-    def test_get_total_income(self, db_module):
+    def test_get_total_income(self, db_module, make_user):
         """get_total_income should sum all income entries with frequency conversion."""
-        user_id = db_module.create_user("incometest4", "testpass")
+        user_id = make_user("incometest4")
         db_module.update_income(user_id, "Alice", 30000, "monthly")  # 30000/month
         db_module.update_income(user_id, "Bob", 12000, "yearly")  # 1000/month
 
         total = db_module.get_total_income(user_id)
         assert total == 31000  # 30000 + 1000
 
-    def test_income_monthly_amount_quarterly(self, db_module):
-        """Income monthly_amount should divide by 3 for quarterly."""
-        user_id = db_module.create_user("incometest4a", "testpass")
-        db_module.add_income(user_id, "Quarterly", 9000, "quarterly")
-
-        incomes = db_module.get_all_income(user_id)
-        assert incomes[0].monthly_amount == 3000
-
-    def test_income_monthly_amount_semiannual(self, db_module):
-        """Income monthly_amount should divide by 6 for semi-annual."""
-        user_id = db_module.create_user("incometest4b", "testpass")
-        db_module.add_income(user_id, "Semi-Annual", 12000, "semi-annual")
+    @pytest.mark.parametrize("amount,frequency,expected", [
+        (9000, "quarterly", 3000),  # 9000 / 3
+        (12000, "semi-annual", 2000),  # 12000 / 6
+    ])
+    def test_income_monthly_amount_by_frequency(self, db_module, make_user, amount, frequency, expected):
+        """Income monthly_amount should divide by the number of months per period."""
+        user_id = make_user("incometest4a")
+        db_module.add_income(user_id, "Periodic", amount, frequency)
 
         incomes = db_module.get_all_income(user_id)
-        assert incomes[0].monthly_amount == 2000  # 12000 / 6
+        assert incomes[0].monthly_amount == expected
 
-    def test_income_isolation_between_users(self, db_module):
+    def test_income_isolation_between_users(self, db_module, make_user):
         """Each user should only see their own income."""
-        user1 = db_module.create_user("incometest5a", "testpass")
-        user2 = db_module.create_user("incometest5b", "testpass")
+        user1 = make_user("incometest5a")
+        user2 = make_user("incometest5b")
 
         db_module.add_income(user1, "User1 Income", 50000)
         db_module.add_income(user2, "User2 Income", 40000)
@@ -146,13 +142,32 @@ class TestIncomeOperations:
         assert incomes1[0].person == "User1 Income"
         assert incomes2[0].person == "User2 Income"
 
+    def test_replace_all_income(self, db_module, make_user):
+        """replace_all_income should swap a user's income for the given rows."""
+        user_id = make_user("incometest6")
+        other_id = make_user("incometest6b")
+        db_module.add_income(user_id, "Old", 10000)
+        db_module.add_income(other_id, "Other", 20000)
+
+        db_module.replace_all_income(user_id, [
+            ("Alice", 30000, "monthly"),
+            ("Bonus", 6000, "yearly"),
+            ("Alice", 32000, "monthly"),  # repeated person: last one wins
+        ])
+
+        by_person = {i.person: i for i in db_module.get_all_income(user_id)}
+        assert set(by_person) == {"Alice", "Bonus"}
+        assert by_person["Alice"].amount == 32000
+        assert by_person["Bonus"].frequency == "yearly"
+        assert len(db_module.get_all_income(other_id)) == 1
+
 
 class TestExpenseOperations:
     """Tests for expense CRUD operations."""
 
-    def test_add_expense(self, db_module):
+    def test_add_expense(self, db_module, make_user):
         """add_expense should create a new expense."""
-        user_id = db_module.create_user("expensetest1", "testpass")
+        user_id = make_user("expensetest1")
         expense_id = db_module.add_expense(user_id, "Husleje", "Bolig", 10000, "monthly")
 
         assert expense_id is not None
@@ -162,41 +177,23 @@ class TestExpenseOperations:
         assert expense.amount == 10000
         assert expense.frequency == "monthly"
 
-    def test_expense_monthly_amount_for_monthly(self, db_module):
-        """monthly_amount should return same amount for monthly expenses."""
-        user_id = db_module.create_user("expensetest2", "testpass")
-        expense_id = db_module.add_expense(user_id, "Test", "Bolig", 1000, "monthly")
-        expense = db_module.get_expense_by_id(expense_id, user_id)
-
-        assert expense.monthly_amount == 1000
-
-    def test_expense_monthly_amount_for_yearly(self, db_module):
-        """monthly_amount should divide by 12 for yearly expenses."""
-        user_id = db_module.create_user("expensetest3", "testpass")
-        expense_id = db_module.add_expense(user_id, "Forsikring", "Forsikring", 12000, "yearly")
-        expense = db_module.get_expense_by_id(expense_id, user_id)
-
-        assert expense.monthly_amount == 1000  # 12000 / 12
-
-    def test_expense_monthly_amount_for_quarterly(self, db_module):
-        """monthly_amount should divide by 3 for quarterly expenses."""
-        user_id = db_module.create_user("expensetest3a", "testpass")
-        expense_id = db_module.add_expense(user_id, "Vand", "Forbrug", 2400, "quarterly")
-        expense = db_module.get_expense_by_id(expense_id, user_id)
-
-        assert expense.monthly_amount == 800  # 2400 / 3
-
-    def test_expense_monthly_amount_for_semiannual(self, db_module):
-        """monthly_amount should divide by 6 for semi-annual expenses."""
-        user_id = db_module.create_user("expensetest3b", "testpass")
-        expense_id = db_module.add_expense(user_id, "Bilservice", "Transport", 4500, "semi-annual")
+    @pytest.mark.parametrize("amount,frequency,expected", [
+        (1000, "monthly", 1000),
+        (12000, "yearly", 1000),  # 12000 / 12
+        (2400, "quarterly", 800),  # 2400 / 3
+        (4500, "semi-annual", 750),  # 4500 / 6
+    ])
+    def test_expense_monthly_amount_by_frequency(self, db_module, make_user, amount, frequency, expected):
+        """monthly_amount should divide by the number of months per period."""
+        user_id = make_user("expensetest2")
+        expense_id = db_module.add_expense(user_id, "Test", "Bolig", amount, frequency)
         expense = db_module.get_expense_by_id(expense_id, user_id)
 
-        assert expense.monthly_amount == 750  # 4500 / 6
+        assert expense.monthly_amount == expected
 
-    def test_update_expense(self, db_module):
+    def test_update_expense(self, db_module, make_user):
         """update_expense should modify existing expense."""
-        user_id = db_module.create_user("expensetest4", "testpass")
+        user_id = make_user("expensetest4")
         expense_id = db_module.add_expense(user_id, "Old Name", "Bolig", 5000, "monthly")
         db_module.update_expense(expense_id, user_id, "New Name", "Transport", 6000, "yearly")
 
@@ -206,29 +203,31 @@ class TestExpenseOperations:
         assert expense.amount == 6000
         assert expense.frequency == "yearly"
 
-    def test_delete_expense(self, db_module):
+    def test_delete_expense(self, db_module, make_user):
         """delete_expense should remove the expense."""
-        user_id = db_module.create_user("expensetest5", "testpass")
+        user_id = make_user("expensetest5")
         expense_id = db_module.add_expense(user_id, "To Delete", "Bolig", 1000, "monthly")
         db_module.delete_expense(expense_id, user_id)
 
         expense = db_module.get_expense_by_id(expense_id, user_id)
         assert expense is None
 
-    def test_get_total_monthly_expenses(self, db_module):
+    def test_get_total_monthly_expenses(self, db_module, make_user):
         """get_total_monthly_expenses should calculate correct total with all frequencies."""
-        user_id = db_module.create_user("expensetest6", "testpass")
-        db_module.add_expense(user_id, "Monthly", "Bolig", 1000, "monthly")  # 1000/month
-        db_module.add_expense(user_id, "Quarterly", "Forbrug", 900, "quarterly")  # 300/month
-        db_module.add_expense(user_id, "Semi-Annual", "Transport", 600, "semi-annual")  # 100/month
-        db_module.add_expense(user_id, "Yearly", "Forsikring", 1200, "yearly")  # 100/month
+        user_id = make_user("expensetest6")
+        db_module.add_expenses_bulk(user_id, [
+            ("Monthly", "Bolig", 1000, "monthly"),  # 1000/month
+            ("Quarterly", "Forbrug", 900, "quarterly"),  # 300/month
+            ("Semi-Annual", "Transport", 600, "semi-annual"),  # 100/month
+            ("Yearly", "Forsikring", 1200, "yearly"),  # 100/month
+        ])
 
         total = db_module.get_total_monthly_expenses(user_id)
         assert total == 1500  # 1000 + 300 + 100 + 100
 
-    def test_get_expenses_by_category(self, db_module):
+    def test_get_expenses_by_category(self, db_module, make_user):
         """get_expenses_by_category should group expenses correctly."""
-        user_id = db_module.create_user("expensetest7", "testpass")
+        user_id = make_user("expensetest7")
         db_module.add_expense(user_id, "Expense 1", "Bolig", 1000, "monthly")
         db_module.add_expense(user_id, "Expense 2", "Bolig", 2000, "monthly")
         db_module.add_expense(user_id, "Expense 3", "Transport", 500, "monthly")
@@ -238,20 +237,57 @@ class TestExpenseOperations:
         assert len(grouped["Bolig"]) == 2
         assert len(grouped["Transport"]) == 1
 
-    def test_get_category_totals(self, db_module):
+    def test_get_category_totals(self, db_module, make_user):
         """get_category_totals should sum monthly amounts per category."""
-        user_id = db_module.create_user("expensetest8", "testpass")
-        db_module.add_expense(user_id, "Rent", "Bolig", 10000, "monthly")
-        db_module.add_expense(user_id, "Tax", "Bolig", 12000, "yearly")  # 1000/month
+        user_id = make_user("expensetest8")
+        db_module.add_expenses_bulk(user_id, [
+            ("Rent", "Bolig", 10000, "monthly"),
+            ("Tax", "Bolig", 12000, "yearly"),  # 1000/month
+        ])
 
         totals = db_module.get_category_totals(user_id)
 
         assert totals["Bolig"] == 11000  # 10000 + 1000
 
-    def test_expense_isolation_between_users(self, db_module):
+    def test_get_category_totals_matches_rounded_rows(self, db_module, make_user):
+        """Category totals should use the same rounding as Expense.monthly_amount."""
+        user_id = make_user("expensetest8a")
+        # 84593.94 / 12 = 7049.495 in decimal, but just below it as a float
+        expense_id = db_module.add_expense(user_id, "Insurance", "Forsikring", 84593.94, "yearly")
+
+        totals = db_module.get_category_totals(user_id)
+
+        expense = db_module.get_expense_by_id(expense_id, user_id)
+        assert expense.monthly_amount == 7049.49
+        assert totals["Forsikring"] == expense.monthly_amount
+
+    def test_get_top_expenses(self, db_module, make_user):
+        """get_top_expenses should order by monthly amount and honour the limit."""
+        user_id = make_user("expensetest8b")
+        db_module.add_expense(user_id, "Rent", "Bolig", 10000, "monthly")
+        db_module.add_expense(user_id, "Tax", "Bolig", 60000, "yearly")  # 5000/month
+        db_module.add_expense(user_id, "Food", "Mad", 4000, "monthly")
+
+        top = db_module.get_top_expenses(user_id, 2)
+
+        assert [exp.name for exp in top] == ["Rent", "Tax"]
+
+    def test_add_expenses_bulk(self, db_module, make_user):
+        """add_expenses_bulk should insert every row for the given user."""
+        user_id = make_user("expensetest8c")
+
+        db_module.add_expenses_bulk(user_id, [
+            ("Rent", "Bolig", 10000, "monthly"),
+            ("Tax", "Bolig", 12000, "yearly"),
+        ])
+
+        expenses = db_module.get_all_expenses(user_id)
+        assert [(e.name, e.monthly_amount) for e in expenses] == [("Rent", 10000), ("Tax", 1000)]
+
+    def test_expense_isolation_between_users(self, db_module, make_user):
         """Each user should only see their own expenses."""
-        user1 = db_module.create_user("expensetest9a", "testpass")
-        user2 = db_module.create_user("expensetest9b", "testpass")
+        user1 = make_user("expensetest9a")
+        user2 = make_user("expensetest9b")
 
         db_module.add_expense(user1, "User1 Expense", "Bolig", 5000, "monthly")
         db_module.add_expense(user2, "User2 Expense", "Bolig", 3000, "monthly")
@@ -278,28 +314,24 @@ class TestCategoryOperations:
         assert "Transport" in names
         assert "Mad" in names
 
-    def test_add_category(self, db_module):
-        """add_category should create a new category for a user."""
-        user_id = db_module.create_user("catuser1", "testpass")
-        category_id = db_module.add_category(user_id, "Custom", "star")
+    def test_category_lifecycle(self, db_module, make_user):
+        """A category can be added, updated and, while unused, deleted."""
+        user_id = make_user("catuser1")
 
+        category_id = db_module.add_category(user_id, "Custom", "star")
         category = db_module.get_category_by_id(category_id)
-        assert category.name == "Custom"
-        assert category.icon == "star"
+        assert (category.name, category.icon) == ("Custom", "star")
 
-    def test_update_category(self, db_module):
-        """update_category should modify existing category for a user."""
-        user_id = db_module.create_user("catuser2", "testpass")
-        category_id = db_module.add_category(user_id, "OldName", "old-icon")
         db_module.update_category(category_id, user_id, "NewName", "new-icon")
-
         category = db_module.get_category_by_id(category_id)
-        assert category.name == "NewName"
-        assert category.icon == "new-icon"
+        assert (category.name, category.icon) == ("NewName", "new-icon")
+
+        assert db_module.delete_category(category_id, user_id) is True
+        assert db_module.get_category_by_id(category_id) is None
 
-    def test_update_category_updates_expenses(self, db_module):
+    def test_update_category_updates_expenses(self, db_module, make_user):
         """Renaming a category should update expenses using it."""
-        user_id = db_module.create_user("cattest1", "testpass")
+        user_id = make_user("cattest1")
         category_id = db_module.add_category(user_id, "OldCat", "icon")
         db_module.add_expense(user_id, "Test Expense", "OldCat", 100, "monthly")
 
@@ -309,9 +341,9 @@ class TestCategoryOperations:
         expense = next(e for e in expenses if e.name == "Test Expense")
         assert expense.category == "NewCat"
 
-    def test_update_category_returns_count(self, db_module):
+    def test_update_category_returns_count(self, db_module, make_user):
         """update_category should return the number of updated expenses."""
-        user_id = db_module.create_user("catcount1", "testpass")
+        user_id = make_user("catcount1")
         category_id = db_module.add_category(user_id, "CountCat", "icon")
         db_module.add_expense(user_id, "Expense 1", "CountCat", 50, "monthly")
         db_module.add_expense(user_id, "Expense 2", "CountCat", 75, "monthly")
@@ -324,19 +356,9 @@ class TestCategoryOperations:
         count = db_module.update_category(category_id, user_id, "RenamedCat", "new-icon")
         assert count == 0
 
-    def test_delete_category_not_in_use(self, db_module):
-        """delete_category should work when category is not in use."""
-        user_id = db_module.create_user("catuser3", "testpass")
-        category_id = db_module.add_category(user_id, "Unused", "icon")
-
-        result = db_module.delete_category(category_id, user_id)
-
-        assert result is True
-        assert db_module.get_category_by_id(category_id) is None
-
-    def test_delete_category_in_use_fails(self, db_module):
+    def test_delete_category_in_use_fails(self, db_module, make_user):
         """delete_category should fail when category has expenses."""
-        user_id = db_module.create_user("cattest2", "testpass")
+        user_id = make_user("cattest2")
         category_id = db_module.add_category(user_id, "InUse", "icon")
         db_module.add_expense(user_id, "Uses Category", "InUse", 100, "monthly")
 
@@ -345,9 +367,9 @@ class TestCategoryOperations:
         assert result is False
         assert db_module.get_category_by_id(category_id) is not None
 
-    def test_get_category_usage_count(self, db_module):
+    def test_get_category_usage_count(self, db_module, make_user):
         """get_category_usage_count should return correct count for specific user."""
-        user_id = db_module.create_user("cattest3", "testpass")
+        user_id = make_user("cattest3")
         db_module.add_category(user_id, "TestCat", "icon")
         db_module.add_expense(user_id, "Exp1", "TestCat", 100, "monthly")
         db_module.add_expense(user_id, "Exp2", "TestCat", 200, "monthly")
@@ -355,10 +377,10 @@ class TestCategoryOperations:
         count = db_module.get_category_usage_count("TestCat", user_id)
         assert count == 2
 
-    def test_get_category_usage_count_user_isolation(self, db_module):
+    def test_get_category_usage_count_user_isolation(self, db_module, make_user):
         """get_category_usage_count should only count expenses for the specified user."""
-        user1 = db_module.create_user("catuser1", "testpass")
-        user2 = db_module.create_user("catuser2", "testpass")
+        user1 = make_user("catuser1")
+        user2 = make_user("catuser2")
         # Each user gets their own categories automatically
         db_module.add_category(user1, "SharedCat", "icon")
         db_module.add_category(user2, "SharedCat", "icon")
@@ -375,21 +397,39 @@ class TestCategoryOperations:
         assert db_module.get_category_usage_count("SharedCat", user1) == 3
         assert db_module.get_category_usage_count("SharedCat", user2) == 1
 
+    def test_get_category_usage_counts(self, db_module, make_user):
+        """get_category_usage_counts should match get_category_usage_count for every category."""
+        user_id = make_user("cattest4")
+        other_id = make_user("cattest4b")
+        db_module.add_expense(user_id, "Rent", "Bolig", 100, "monthly")
+        db_module.add_expense(user_id, "Bus", "Transport", 200, "monthly")
+        db_module.add_expense(user_id, "Train", "Transport", 300, "monthly")
+        db_module.add_expense(other_id, "Rent", "Bolig", 400, "monthly")
+
+        counts = db_module.get_category_usage_counts(user_id)
+
+        assert counts == {
+            cat.name: db_module.get_category_usage_count(cat.name, user_id)
+            for cat in db_module.get_all_categories(user_id)
+        }
+        assert counts["Bolig"] == 1
+        assert counts["Transport"] == 2
+
 
 class TestAccountOperations:
     """Tests for account CRUD operations."""
 
-    def test_add_account(self, db_module):
+    def test_add_account(self, db_module, make_user):
         """add_account should create a new account for a user."""
-        user_id = db_module.create_user("accuser1", "testpass")
+        user_id = make_user("accuser1")
         account_id = db_module.add_account(user_id, "Lønkonto")
 
         account = db_module.get_account_by_id(account_id, user_id)
         assert account.name == "Lønkonto"
 
-    def test_get_all_accounts(self, db_module):
+    def test_get_all_accounts(self, db_module, make_user):
         """get_all_accounts should return all accounts for a user."""
-        user_id = db_module.create_user("accuser2", "testpass")
+        user_id = make_user("accuser2")
         db_module.add_account(user_id, "Lønkonto")
         db_module.add_account(user_id, "Budgetkonto")
 
@@ -397,18 +437,18 @@ class TestAccountOperations:
         names = {a.name for a in accounts}
         assert names == {"Lønkonto", "Budgetkonto"}
 
-    def test_update_account(self, db_module):
+    def test_update_account(self, db_module, make_user):
         """update_account should modify existing account for a user."""
-        user_id = db_module.create_user("accuser3", "testpass")
+        user_id = make_user("accuser3")
         account_id = db_module.add_account(user_id, "OldName")
         db_module.update_account(account_id, user_id, "NewName")
 
         account = db_module.get_account_by_id(account_id, user_id)
         assert account.name == "NewName"
 
-    def test_update_account_updates_expenses(self, db_module):
+    def test_update_account_updates_expenses(self, db_module, make_user):
         """Renaming an account should update expenses using it."""
-        user_id = db_module.create_user("acctest1", "testpass")
+        user_id = make_user("acctest1")
         account_id = db_module.add_account(user_id, "OldAcc")
         db_module.add_expense(user_id, "Test Expense", "Bolig", 100, "monthly", "OldAcc")
 
@@ -418,9 +458,9 @@ class TestAccountOperations:
         expense = next(e for e in expenses if e.name == "Test Expense")
         assert expense.account == "NewAcc"
 
-    def test_update_account_returns_count(self, db_module):
+    def test_update_account_returns_count(self, db_module, make_user):
         """update_account should return the number of updated expenses."""
-        user_id = db_module.create_user("acccount1", "testpass")
+        user_id = make_user("acccount1")
         account_id = db_module.add_account(user_id, "CountAcc")
         db_module.add_expense(user_id, "Exp 1", "Bolig", 50, "monthly", "CountAcc")
         db_module.add_expense(user_id, "Exp 2", "Bolig", 75, "monthly", "CountAcc")
@@ -433,9 +473,9 @@ class TestAccountOperations:
         count = db_module.update_account(account_id, user_id, "RenamedAcc")
         assert count == 0
 
-    def test_delete_account_not_in_use(self, db_module):
+    def test_delete_account_not_in_use(self, db_module, make_user):
         """delete_account should work when account is not in use."""
-        user_id = db_module.create_user("accuser4", "testpass")
+        user_id = make_user("accuser4")
         account_id = db_module.add_account(user_id, "Unused")
 
         result = db_module.delete_account(account_id, user_id)
@@ -443,9 +483,9 @@ class TestAccountOperations:
         assert result is True
         assert db_module.get_account_by_id(account_id, user_id) is None
 
-    def test_delete_account_in_use_fails(self, db_module):
+    def test_delete_account_in_use_fails(self, db_module, make_user):
         """delete_account should fail when account has expenses."""
-        user_id = db_module.create_user("acctest2", "testpass")
+        user_id = make_user("acctest2")
         account_id = db_module.add_account(user_id, "InUse")
         db_module.add_expense(user_id, "Uses Account", "Bolig", 100, "monthly", "InUse")
 
@@ -454,9 +494,9 @@ class TestAccountOperations:
         assert result is False
         assert db_module.get_account_by_id(account_id, user_id) is not None
 
-    def test_get_account_usage_count(self, db_module):
+    def test_get_account_usage_count(self, db_module, make_user):
         """get_account_usage_count should return correct count for specific user."""
-        user_id = db_module.create_user("acctest3", "testpass")
+        user_id = make_user("acctest3")
         db_module.add_account(user_id, "TestAcc")
         db_module.add_expense(user_id, "Exp1", "Bolig", 100, "monthly", "TestAcc")
         db_module.add_expense(user_id, "Exp2", "Bolig", 200, "monthly", "TestAcc")
@@ -464,10 +504,10 @@ class TestAccountOperations:
         count = db_module.get_account_usage_count("TestAcc", user_id)
         assert count == 2
 
-    def test_get_account_usage_count_user_isolation(self, db_module):
+    def test_get_account_usage_count_user_isolation(self, db_module, make_user):
         """get_account_usage_count should only count expenses for the specified user."""
-        user1 = db_module.create_user("acciso1", "testpass")
-        user2 = db_module.create_user("acciso2", "testpass")
+        user1 = make_user("acciso1")
+        user2 = make_user("acciso2")
         db_module.add_account(user1, "SharedAcc")
         db_module.add_account(user2, "SharedAcc")
 
@@ -478,9 +518,9 @@ class TestAccountOperations:
         assert db_module.get_account_usage_count("SharedAcc", user1) == 2
         assert db_module.get_account_usage_count("SharedAcc", user2) == 1
 
-    def test_get_account_totals(self, db_module):
+    def test_get_account_totals(self, db_module, make_user):
         """get_account_totals should return monthly totals per account."""
-        user_id = db_module.create_user("acctotal1", "testpass")
+        user_id = make_user("acctotal1")
         db_module.add_account(user_id, "Lønkonto")
         db_module.add_account(user_id, "Budgetkonto")
 
@@ -494,9 +534,9 @@ class TestAccountOperations:
         assert totals["Lønkonto"] == 129
         assert "Ingen konto" not in totals  # Expenses without account excluded
 
-    def test_get_account_totals_with_frequencies(self, db_module):
+    def test_get_account_totals_with_frequencies(self, db_module, make_user):
         """get_account_totals should convert all frequencies to monthly."""
-        user_id = db_module.create_user("acctotal2", "testpass")
+        user_id = make_user("acctotal2")
         db_module.add_account(user_id, "Budget")
 
         db_module.add_expense(user_id, "Monthly", "Bolig", 1200, "monthly", "Budget")
@@ -505,9 +545,9 @@ class TestAccountOperations:
         totals = db_module.get_account_totals(user_id)
         assert totals["Budget"] == 2200  # 1200 + 12000/12
 
-    def test_expense_account_is_optional(self, db_module):
+    def test_expense_account_is_optional(self, db_module, make_user):
         """Expenses should work with and without an account."""
-        user_id = db_module.create_user("accopt1", "testpass")
+        user_id = make_user("accopt1")
 
         # Add expense without account
         exp_id = db_module.add_expense(user_id, "No Account", "Bolig", 100, "monthly")
@@ -556,26 +596,22 @@ class TestUserOperations:
         assert user is not None
         assert user.username == "authuser"
 
-    def test_authenticate_user_wrong_password(self, db_module):
-        """authenticate_user should return None for wrong password."""
+    @pytest.mark.parametrize("username,password", [
+        pytest.param("authuser2", "wrongpass", id="wrong-password"),
+        pytest.param("unknown", "anypass", id="unknown-user"),
+    ])
+    def test_authenticate_user_rejects(self, db_module, username, password):
+        """authenticate_user should return None for bad credentials."""
         db_module.create_user("authuser2", "correctpass")
 
-        user = db_module.authenticate_user("authuser2", "wrongpass")
-
-        assert user is None
+        assert db_module.authenticate_user(username, password) is None
 
-    def test_authenticate_user_unknown_user(self, db_module):
-        """authenticate_user should return None for unknown user."""
-        user = db_module.authenticate_user("unknown", "anypass")
-
-        assert user is None
-
-    def test_get_user_count(self, db_module):
+    def test_get_user_count(self, db_module, make_user):
         """get_user_count should return correct count."""
         initial_count = db_module.get_user_count()
 
-        db_module.create_user("user1x", "pass")
-        db_module.create_user("user2x", "pass")
+        make_user("user1x")
+        make_user("user2x")
 
         assert db_module.get_user_count() == initial_count + 2
 
@@ -620,10 +656,20 @@ class TestDemoData:
 
         assert total > 0
 
-    def test_demo_data_is_read_only(self, db_module):
+    def test_demo_getters_return_fresh_containers(self, db_module):
+        """Mutating a returned demo list or dict should not affect later calls."""
+        expenses = db_module.get_demo_expenses(advanced=True)
+        expenses.clear()
+        totals = db_module.get_demo_account_totals(advanced=True)
+        totals.clear()
+
+        assert len(db_module.get_demo_expenses(advanced=True)) > 0
+        assert len(db_module.get_demo_account_totals(advanced=True)) > 0
+
+    def test_demo_data_is_read_only(self, db_module, make_user):
         """Demo data should be independent of database state."""
         # Add real expense (need user first)
-        user_id = db_module.create_user("demotest1", "testpass")
+        user_id = make_user("demotest1")
         db_module.add_expense(user_id, "Real Expense", "Bolig", 99999, "monthly")
 
         # Demo data should not include it
@@ -642,23 +688,17 @@ class TestEmailHashing:
 
         assert email_hash is not None
         assert len(email_hash) == 64  # SHA-256 hex = 64 chars
-        assert all(c in "0123456789abcdef" for c in email_hash)
-
-    def test_hash_email_is_case_insensitive(self, db_module):
-        """hash_email should produce same hash regardless of case."""
-        hash1 = db_module.hash_email("Test@Example.COM")
-        hash2 = db_module.hash_email("test@example.com")
-        hash3 = db_module.hash_email("TEST@EXAMPLE.COM")
-
-        assert hash1 == hash2 == hash3
-
-    def test_hash_email_strips_whitespace(self, db_module):
-        """hash_email should strip leading/trailing whitespace."""
-        hash1 = db_module.hash_email("test@example.com")
-        hash2 = db_module.hash_email("  test@example.com  ")
-        hash3 = db_module.hash_email("\ttest@example.com\n")
-
-        assert hash1 == hash2 == hash3
+        assert bytes.fromhex(email_hash).hex() == email_hash  # lowercase hex only
+
+    @pytest.mark.parametrize("email", [
+        pytest.param("Test@Example.COM", id="mixed-case"),
+        pytest.param("TEST@EXAMPLE.COM", id="upper-case"),
+        pytest.param("  test@example.com  ", id="spaces"),
+        pytest.param("\ttest@example.com\n", id="tab-newline"),
+    ])
+    def test_hash_email_normalizes(self, db_module, email):
+        """hash_email should ignore case and leading/trailing whitespace."""
+        assert db_module.hash_email(email) == db_module.hash_email("test@example.com")
 
     def test_hash_email_different_emails_produce_different_hashes(self, db_module):
         """Different emails should produce different hashes."""
@@ -671,40 +711,29 @@ class TestEmailHashing:
 class TestUserEmailOperations:
     """Tests for user email update and lookup operations."""
 
-    def test_update_user_email_stores_hash(self, db_module):
+    def test_update_user_email_stores_hash(self, db_module, make_user):
         """update_user_email should store email hash for user."""
-        user_id = db_module.create_user("emailuser1", "testpass")
+        user_id = make_user("emailuser1")
 
         db_module.update_user_email(user_id, "user@example.com")
 
         user = db_module.get_user_by_id(user_id)
         assert user.email_hash is not None
 
-    def test_update_user_email_clears_email_when_empty(self, db_module):
-        """update_user_email should clear email when passed empty value."""
-        user_id = db_module.create_user("emailuser2", "testpass")
+    @pytest.mark.parametrize("empty", [None, ""])
+    def test_update_user_email_clears_email(self, db_module, make_user, empty):
+        """update_user_email should clear email when passed None or an empty string."""
+        user_id = make_user("emailuser2")
         db_module.update_user_email(user_id, "user@example.com")
 
-        # Clear email
-        db_module.update_user_email(user_id, None)
+        db_module.update_user_email(user_id, empty)
 
         user = db_module.get_user_by_id(user_id)
         assert user.email_hash is None
 
-    def test_update_user_email_clears_with_empty_string(self, db_module):
-        """update_user_email should clear when email is empty string."""
-        user_id = db_module.create_user("emailuser3", "testpass")
-        db_module.update_user_email(user_id, "user@example.com")
-
-        # Clear email with empty string
-        db_module.update_user_email(user_id, "")
-
-        user = db_module.get_user_by_id(user_id)
-        assert user.email_hash is None
-
-    def test_get_user_by_email_returns_user(self, db_module):
+    def test_get_user_by_email_returns_user(self, db_module, make_user):
         """get_user_by_email should return user with matching email."""
-        user_id = db_module.create_user("emailuser4", "testpass")
+        user_id = make_user("emailuser4")
         db_module.update_user_email(user_id, "findme@example.com")
 
         found_user = db_module.get_user_by_email("findme@example.com")
@@ -713,9 +742,9 @@ class TestUserEmailOperations:
         assert found_user.id == user_id
         assert found_user.username == "emailuser4"
 
-    def test_get_user_by_email_is_case_insensitive(self, db_module):
+    def test_get_user_by_email_is_case_insensitive(self, db_module, make_user):
         """get_user_by_email should find user regardless of email case."""
-        user_id = db_module.create_user("emailuser5", "testpass")
+        user_id = make_user("emailuser5")
         db_module.update_user_email(user_id, "CaseSensitive@Example.COM")
 
         # Should find with different case
@@ -724,9 +753,9 @@ class TestUserEmailOperations:
         assert found_user is not None
         assert found_user.id == user_id
 
-    def test_get_user_by_email_strips_whitespace(self, db_module):
+    def test_get_user_by_email_strips_whitespace(self, db_module, make_user):
         """get_user_by_email should find user even with whitespace in query."""
-        user_id = db_module.create_user("emailuser6", "testpass")
+        user_id = make_user("emailuser6")
         db_module.update_user_email(user_id, "test@example.com")
 
         # Should find with whitespace
@@ -735,32 +764,28 @@ class TestUserEmailOperations:
         assert found_user is not None
         assert found_user.id == user_id
 
-    def test_get_user_by_email_returns_none_for_nonexistent(self, db_module):
-        """get_user_by_email should return None for unknown email."""
-        found_user = db_module.get_user_by_email("nobody@example.com")
-
-        assert found_user is None
-
-    def test_get_user_by_email_returns_none_for_user_without_email(self, db_module):
-        """get_user_by_email should not find users without email set."""
-        db_module.create_user("noemailuser", "testpass")
+    @pytest.mark.parametrize("email", [
+        pytest.param("nobody@example.com", id="unknown-email"),
+        pytest.param("noemailuser@example.com", id="user-without-email"),
+    ])
+    def test_get_user_by_email_returns_none(self, db_module, make_user, email):
+        """get_user_by_email should not match unknown emails or users without one."""
+        make_user("noemailuser")
 
-        found_user = db_module.get_user_by_email("noemailuser@example.com")
+        assert db_module.get_user_by_email(email) is None
 
-        assert found_user is None
-
-    def test_user_has_email_returns_true_when_set(self, db_module):
+    def test_user_has_email_returns_true_when_set(self, db_module, make_user):
         """User.has_email() should return True when email is set."""
-        user_id = db_module.create_user("hasemailuser", "testpass")
+        user_id = make_user("hasemailuser")
         db_module.update_user_email(user_id, "has@example.com")
 
         user = db_module.get_user_by_id(user_id)
 
         assert user.has_email() is True
 
-    def test_user_has_email_returns_false_when_not_set(self, db_module):
+    def test_user_has_email_returns_false_when_not_set(self, db_module, make_user):
         """User.has_email() should return False when email is not set."""
-        user_id = db_module.create_user("noemailuser2", "testpass")
+        user_id = make_user("noemailuser2")
 
         user = db_module.get_user_by_id(user_id)
 
@@ -770,9 +795,9 @@ class TestUserEmailOperations:
 class TestPasswordResetTokens:
     """Tests for password reset token operations."""
 
-    def test_create_password_reset_token_returns_id(self, db_module):
+    def test_create_password_reset_token_returns_id(self, db_module, make_user):
         """create_password_reset_token should return a token ID."""
-        user_id = db_module.create_user("resetuser1", "testpass")
+        user_id = make_user("resetuser1")
         token_hash = "abc123hash"
         expires_at = "2099-12-31 23:59:59"
 
@@ -781,9 +806,9 @@ class TestPasswordResetTokens:
         assert token_id is not None
         assert isinstance(token_id, int)
 
-    def test_create_password_reset_token_invalidates_old_tokens(self, db_module):
+    def test_create_password_reset_token_invalidates_old_tokens(self, db_module, make_user):
         """create_password_reset_token should invalidate previous tokens."""
-        user_id = db_module.create_user("resetuser2", "testpass")
+        user_id = make_user("resetuser2")
         expires_at = "2099-12-31 23:59:59"
 
         # Create first token
@@ -799,9 +824,9 @@ class TestPasswordResetTokens:
         assert first_token is None  # Invalidated
         assert second_token is not None  # Still valid
 
-    def test_get_valid_reset_token_returns_token(self, db_module):
+    def test_get_valid_reset_token_returns_token(self, db_module, make_user):
         """get_valid_reset_token should return valid token."""
-        user_id = db_module.create_user("resetuser3", "testpass")
+        user_id = make_user("resetuser3")
         token_hash = "validhash123"
         expires_at = "2099-12-31 23:59:59"
 
@@ -813,39 +838,23 @@ class TestPasswordResetTokens:
         assert token.token_hash == token_hash
         assert token.used is False
 
-    def test_get_valid_reset_token_returns_none_for_unknown(self, db_module):
-        """get_valid_reset_token should return None for unknown hash."""
-        token = db_module.get_valid_reset_token("unknownhash")
-
-        assert token is None
-
-    def test_get_valid_reset_token_returns_none_for_expired(self, db_module):
-        """get_valid_reset_token should return None for expired token."""
-        user_id = db_module.create_user("resetuser4", "testpass")
-        token_hash = "expiredhash"
-        expires_at = "2000-01-01 00:00:00"  # Already expired
+    @pytest.mark.parametrize("case", ["unknown", "expired", "used"])
+    def test_get_valid_reset_token_returns_none_for_invalid(self, db_module, make_user, case):
+        """get_valid_reset_token should return None for unknown, expired or used tokens."""
+        user_id = make_user("resetuser4")
+        token_hash = "tokenhash"
 
-        db_module.create_password_reset_token(user_id, token_hash, expires_at)
-        token = db_module.get_valid_reset_token(token_hash)
+        if case == "expired":
+            db_module.create_password_reset_token(user_id, token_hash, "2000-01-01 00:00:00")
+        elif case == "used":
+            token_id = db_module.create_password_reset_token(user_id, token_hash, "2099-12-31 23:59:59")
+            db_module.mark_reset_token_used(token_id)
 
-        assert token is None
-
-    def test_get_valid_reset_token_returns_none_for_used(self, db_module):
-        """get_valid_reset_token should return None for used token."""
-        user_id = db_module.create_user("resetuser5", "testpass")
-        token_hash = "usedhash"
-        expires_at = "2099-12-31 23:59:59"
-
-        token_id = db_module.create_password_reset_token(user_id, token_hash, expires_at)
-        db_module.mark_reset_token_used(token_id)
-
-        token = db_module.get_valid_reset_token(token_hash)
-
-        assert token is None
+        assert db_module.get_valid_reset_token(token_hash) is None
 
-    def test_mark_reset_token_used(self, db_module):
+    def test_mark_reset_token_used(self, db_module, make_user):
         """mark_reset_token_used should mark token as used."""
-        user_id = db_module.create_user("resetuser6", "testpass")
+        user_id = make_user("resetuser6")
         token_hash = "markusedhash"
         expires_at = "2099-12-31 23:59:59"
 
@@ -877,74 +886,46 @@ class TestPasswordResetTokens:
 class TestDecimalCalculations:
     """Tests for decimal amount calculations."""
 
-    def test_income_monthly_amount_with_decimals(self, db_module):
-        """monthly_amount should handle decimals correctly."""
-        user_id = db_module.create_user("decimaltest1", "testpass")
-        db_module.add_income(user_id, "Person 1", 1234.56, "monthly")
+    @pytest.mark.parametrize("amount,frequency,expected", [
+        (1234.56, "monthly", 1234.56),
+        (3000.00, "quarterly", 1000.00),
+        (6000.60, "semi-annual", 1000.10),  # 6000.60 / 6
+    ])
+    def test_income_monthly_amount_with_decimals(self, db_module, make_user, amount, frequency, expected):
+        """Income monthly_amount should keep decimals through frequency conversion."""
+        user_id = make_user("decimaltest1")
+        db_module.add_income(user_id, "Person 1", amount, frequency)
 
         incomes = db_module.get_all_income(user_id)
-        assert incomes[0].amount == 1234.56
-        assert incomes[0].monthly_amount == 1234.56
-
-    def test_expense_monthly_amount_with_decimals(self, db_module):
-        """Expense monthly_amount should handle decimals correctly."""
-        user_id = db_module.create_user("decimaltest2", "testpass")
-        db_module.add_expense(user_id, "Test Expense", "Bolig", 1234.56, "monthly")
+        assert incomes[0].amount == amount
+        assert incomes[0].monthly_amount == expected
+
+    @pytest.mark.parametrize("amount,frequency,expected", [
+        (1234.56, "monthly", 1234.56),
+        (1200.50, "yearly", 100.04),  # 100.041666... rounds to 100.04
+        (100.00, "quarterly", 33.33),  # 33.333... rounds to 33.33
+    ])
+    def test_expense_monthly_amount_with_decimals(self, db_module, make_user, amount, frequency, expected):
+        """Expense monthly_amount should round frequency conversions to 2 decimals."""
+        user_id = make_user("decimaltest2")
+        expense_id = db_module.add_expense(user_id, "Test Expense", "Bolig", amount, frequency)
 
-        expenses = db_module.get_all_expenses(user_id)
-        assert expenses[0].amount == 1234.56
-        assert expenses[0].monthly_amount == 1234.56
-
-    def test_income_quarterly_to_monthly_with_decimals(self, db_module):
-        """Should correctly convert quarterly to monthly with decimals."""
-        user_id = db_module.create_user("decimaltest3", "testpass")
-        db_module.add_income(user_id, "Bonus", 3000.00, "quarterly")
-
-        incomes = db_module.get_all_income(user_id)
-        assert incomes[0].amount == 3000.00
-        assert incomes[0].monthly_amount == 1000.00
-
-    def test_expense_yearly_to_monthly_with_rounding(self, db_module):
-        """Should correctly convert yearly to monthly with rounding."""
-        user_id = db_module.create_user("decimaltest4", "testpass")
-        db_module.add_expense(user_id, "Insurance", "Forsikring", 1200.50, "yearly")
-
-        expenses = db_module.get_all_expenses(user_id)
-        # 1200.50 / 12 = 100.041666... should round to 100.04
-        assert expenses[0].amount == 1200.50
-        assert expenses[0].monthly_amount == 100.04
-
-    def test_income_semi_annual_to_monthly_with_decimals(self, db_module):
-        """Should correctly convert semi-annual to monthly."""
-        user_id = db_module.create_user("decimaltest5", "testpass")
-        db_module.add_income(user_id, "Semi-annual Bonus", 6000.60, "semi-annual")
-
-        incomes = db_module.get_all_income(user_id)
-        # 6000.60 / 6 = 1000.10
-        assert incomes[0].amount == 6000.60
-        assert incomes[0].monthly_amount == 1000.10
-
-    def test_expense_with_precise_division(self, db_module):
-        """Should handle precise division with proper rounding."""
-        user_id = db_module.create_user("decimaltest6", "testpass")
-        # 100.00 / 3 = 33.333... should round to 33.33
-        db_module.add_expense(user_id, "Quarterly Fee", "Andet", 100.00, "quarterly")
-
-        expenses = db_module.get_all_expenses(user_id)
-        assert expenses[0].monthly_amount == 33.33
+        expense = db_module.get_expense_by_id(expense_id, user_id)
+        assert expense.amount == amount
+        assert expense.monthly_amount == expected
 
-    def test_total_income_with_decimals(self, db_module):
+    def test_total_income_with_decimals(self, db_module, make_user):
         """Total income should handle decimals correctly."""
-        user_id = db_module.create_user("decimaltest7", "testpass")
+        user_id = make_user("decimaltest7")
         db_module.add_income(user_id, "Person 1", 1234.56, "monthly")
         db_module.add_income(user_id, "Person 2", 2345.67, "monthly")
 
         total = db_module.get_total_income(user_id)
         assert total == 3580.23
 
-    def test_total_expenses_with_decimals(self, db_module):
+    def test_total_expenses_with_decimals(self, db_module, make_user):
         """Total expenses should handle decimals correctly."""
-        user_id = db_module.create_user("decimaltest8", "testpass")
+        user_id = make_user("decimaltest8")
         db_module.add_expense(user_id, "Expense 1", "Bolig", 1234.56, "monthly")
         db_module.add_expense(user_id, "Expense 2", "Mad", 2345.67, "monthly")
 
@@ -955,33 +936,18 @@ class TestDecimalCalculations:
 class TestExpenseMonthlyAmounts:
     """Tests for Expense.get_monthly_amounts() method."""
 
-    def test_monthly_expense_no_months(self, db_module):
-        exp = db_module.Expense(id=1, user_id=1, name="Husleje", category="Bolig",
-                                amount=6000, frequency="monthly", months=None)
-        result = exp.get_monthly_amounts()
-        assert len(result) == 12
-        assert all(v == 6000 for v in result.values())
-
-    def test_yearly_expense_no_months(self, db_module):
-        exp = db_module.Expense(id=1, user_id=1, name="Forsikring", category="Forsikring",
-                                amount=12000, frequency="yearly", months=None)
-        result = exp.get_monthly_amounts()
-        assert len(result) == 12
-        assert all(v == 1000 for v in result.values())
-
-    def test_semi_annual_expense_no_months(self, db_module):
-        exp = db_module.Expense(id=1, user_id=1, name="Service", category="Transport",
-                                amount=6000, frequency="semi-annual", months=None)
-        result = exp.get_monthly_amounts()
-        assert len(result) == 12
-        assert all(v == 1000 for v in result.values())
-
-    def test_quarterly_expense_no_months(self, db_module):
-        exp = db_module.Expense(id=1, user_id=1, name="Vand", category="Forbrug",
-                                amount=2400, frequency="quarterly", months=None)
+    @pytest.mark.parametrize("amount,frequency,expected", [
+        (6000, "monthly", 6000),
+        (12000, "yearly", 1000),
+        (6000, "semi-annual", 1000),
+        (2400, "quarterly", 800),
+    ])
+    def test_expense_without_months_spreads_evenly(self, db_module, amount, frequency, expected):
+        exp = db_module.Expense(id=1, user_id=1, name="Udgift", category="Bolig",
+                                amount=amount, frequency=frequency, months=None)
         result = exp.get_monthly_amounts()
         assert len(result) == 12
-        assert all(v == 800 for v in result.values())
+        assert all(v == expected for v in result.values())
 
     def test_yearly_expense_with_months(self, db_module):
         exp = db_module.Expense(id=1, user_id=1, name="Skat", category="Bolig",
@@ -1020,8 +986,8 @@ class TestMonthsMigration:
         conn.close()
         assert "months" in columns
 
-    def test_existing_expenses_have_null_months(self, db_module):
-        user_id = db_module.create_user("migrationtest", "testpass")
+    def test_existing_expenses_have_null_months(self, db_module, make_user):
+        user_id = make_user("migrationtest")
         expense_id = db_module.add_expense(user_id, "Test", "Bolig", 1000, "monthly")
         expense = db_module.get_expense_by_id(expense_id, user_id)
         assert expense.months is None
@@ -1030,39 +996,39 @@ class TestMonthsMigration:
 class TestExpenseCRUDWithMonths:
     """Tests for expense CRUD operations with months field."""
 
-    def test_add_expense_with_months(self, db_module):
+    def test_add_expense_with_months(self, db_module, make_user):
         """add_expense should store months as JSON."""
-        user_id = db_module.create_user("monthstest1", "testpass")
+        user_id = make_user("monthstest1")
         expense_id = db_module.add_expense(user_id, "Forsikring", "Forsikring", 6000, "semi-annual", months=[3, 9])
         expense = db_module.get_expense_by_id(expense_id, user_id)
         assert expense.months == [3, 9]
 
-    def test_add_expense_without_months(self, db_module):
+    def test_add_expense_without_months(self, db_module, make_user):
         """add_expense without months should store None."""
-        user_id = db_module.create_user("monthstest2", "testpass")
+        user_id = make_user("monthstest2")
         expense_id = db_module.add_expense(user_id, "Husleje", "Bolig", 10000, "monthly")
         expense = db_module.get_expense_by_id(expense_id, user_id)
         assert expense.months is None
 
-    def test_update_expense_with_months(self, db_module):
+    def test_update_expense_with_months(self, db_module, make_user):
         """update_expense should update months field."""
-        user_id = db_module.create_user("monthstest3", "testpass")
+        user_id = make_user("monthstest3")
         expense_id = db_module.add_expense(user_id, "Skat", "Bolig", 18000, "yearly")
         db_module.update_expense(expense_id, user_id, "Skat", "Bolig", 18000, "yearly", months=[7])
         expense = db_module.get_expense_by_id(expense_id, user_id)
         assert expense.months == [7]
 
-    def test_update_expense_clear_months(self, db_module):
+    def test_update_expense_clear_months(self, db_module, make_user):
         """update_expense with months=None should clear months."""
-        user_id = db_module.create_user("monthstest4", "testpass")
+        user_id = make_user("monthstest4")
         expense_id = db_module.add_expense(user_id, "Skat", "Bolig", 18000, "yearly", months=[1])
         db_module.update_expense(expense_id, user_id, "Skat", "Bolig", 18000, "yearly", months=None)
         expense = db_module.get_expense_by_id(expense_id, user_id)
         assert expense.months is None
 
-    def test_get_all_expenses_includes_months(self, db_module):
+    def test_get_all_expenses_includes_months(self, db_module, make_user):
         """get_all_expenses should include months field."""
-        user_id = db_module.create_user("monthstest5", "testpass")
+        user_id = make_user("monthstest5")
         db_module.add_expense(user_id, "Forsikring", "Forsikring", 6000, "semi-annual", months=[3, 9])
         db_module.add_expense(user_id, "Husleje", "Bolig", 10000, "monthly")
         expenses = db_module.get_all_expenses(user_id)
@@ -1074,24 +1040,24 @@ class TestExpenseCRUDWithMonths:
 class TestYearlyOverview:
     """Tests for yearly overview data calculation."""
 
-    def test_yearly_overview_empty(self, db_module):
+    def test_yearly_overview_empty(self, db_module, make_user):
         """Empty budget should return zeros."""
-        user_id = db_module.create_user("yearlytest1", "testpass")
+        user_id = make_user("yearlytest1")
         result = db_module.get_yearly_overview(user_id)
         assert result['categories'] == {}
         assert all(result['totals'][m] == 0 for m in range(1, 13))
 
-    def test_yearly_overview_monthly_expense(self, db_module):
+    def test_yearly_overview_monthly_expense(self, db_module, make_user):
         """Monthly expense shows same amount every month."""
-        user_id = db_module.create_user("yearlytest2", "testpass")
+        user_id = make_user("yearlytest2")
         db_module.add_expense(user_id, "Husleje", "Bolig", 10000, "monthly")
         result = db_module.get_yearly_overview(user_id)
         assert all(result['categories']['Bolig'][m] == 10000 for m in range(1, 13))
         assert result['year_total'] == 120000
 
-    def test_yearly_overview_with_months(self, db_module):
+    def test_yearly_overview_with_months(self, db_module, make_user):
         """Expense with months assigned shows in correct months."""
-        user_id = db_module.create_user("yearlytest3", "testpass")
+        user_id = make_user("yearlytest3")
         db_module.add_expense(user_id, "Forsikring", "Forsikring", 6000, "semi-annual", months=[3, 9])
         result = db_module.get_yearly_overview(user_id)
         assert result['categories']['Forsikring'][3] == 3000
@@ -1099,33 +1065,33 @@ class TestYearlyOverview:
         assert result['categories']['Forsikring'][1] == 0
         assert result['year_total'] == 6000
 
-    def test_yearly_overview_mixed_expenses(self, db_module):
+    def test_yearly_overview_mixed_expenses(self, db_module, make_user):
         """Multiple expenses combine correctly per category."""
-        user_id = db_module.create_user("yearlytest4", "testpass")
+        user_id = make_user("yearlytest4")
         db_module.add_expense(user_id, "Husleje", "Bolig", 10000, "monthly")
         db_module.add_expense(user_id, "Ejendomsskat", "Bolig", 18000, "yearly", months=[1])
         result = db_module.get_yearly_overview(user_id)
         assert result['categories']['Bolig'][1] == 28000  # 10000 + 18000
         assert result['categories']['Bolig'][2] == 10000   # Only husleje
 
-    def test_yearly_overview_totals(self, db_module):
+    def test_yearly_overview_totals(self, db_module, make_user):
         """Totals row sums all categories per month."""
-        user_id = db_module.create_user("yearlytest5", "testpass")
+        user_id = make_user("yearlytest5")
         db_module.add_expense(user_id, "Husleje", "Bolig", 5000, "monthly")
         db_module.add_expense(user_id, "Mad", "Mad", 3000, "monthly")
         result = db_module.get_yearly_overview(user_id)
         assert all(result['totals'][m] == 8000 for m in range(1, 13))
 
-    def test_yearly_overview_income(self, db_module):
+    def test_yearly_overview_income(self, db_module, make_user):
         """Income is spread equally (no months support)."""
-        user_id = db_module.create_user("yearlytest6", "testpass")
+        user_id = make_user("yearlytest6")
         db_module.add_income(user_id, "Løn", 30000, "monthly")
         result = db_module.get_yearly_overview(user_id)
         assert all(result['income'][m] == 30000 for m in range(1, 13))
 
-    def test_yearly_overview_balance(self, db_module):
+    def test_yearly_overview_balance(self, db_module, make_user):
         """Balance = income - expenses per month."""
-        user_id = db_module.create_user("yearlytest7", "testpass")
+        user_id = make_user("yearlytest7")
         db_module.add_income(user_id, "Løn", 30000, "monthly")
         db_module.add_expense(user_id, "Husleje", "Bolig", 10000, "monthly")
         db_module.add_expense(user_id, "Skat", "Bolig", 18000, "yearly", months=[1])
@@ -0,0 +1,67 @@
+"""Tests for the pure amount parsing and formatting helpers."""
+
+import pytest
+
+from src import api
+from src.api import format_currency, parse_danish_amount
+
+
+class TestAmountParsing:
+    """Tests for Danish amount format parsing."""
+
+    @pytest.mark.parametrize("amount_str,expected", [
+        ("1234,50", 1234.50),      # comma as decimal separator
+        ("1.234,50", 1234.50),     # thousands separator with comma
+        ("12.345,67", 12345.67),
+        ("1234", 1234.00),         # whole number
+        ("1234,5", 1234.50),       # single decimal place
+        ("  1234,50  ", 1234.50),  # surrounding whitespace
+        ("0", 0.00),
+        ("0,00", 0.00),
+    ])
+    def test_parse_danish_amount(self, amount_str, expected):
+        """Should parse valid Danish amounts."""
+        assert parse_danish_amount(amount_str) == expected
+
+    @pytest.mark.parametrize("amount_str", [
+        "",            # empty
+        "abc",         # text
+        "12,34,56",    # multiple commas
+        "1,234.50",    # thousands separator after the decimal comma
+        "²",           # non-ASCII digit
+        "nan",         # float() specials
+        "inf",
+        "1e3",         # exponent notation
+        "1_000",       # Python digit grouping
+    ])
+    def test_parse_danish_amount_invalid(self, amount_str):
+        """Should raise ValueError for invalid input."""
+        with pytest.raises(ValueError):
+            parse_danish_amount(amount_str)
+
+
+class TestCurrencyFormatting:
+    """Tests for currency display formatting."""
+
+    @pytest.mark.parametrize("amount,expected", [
+        (1234.50, "1.234,50 kr"),      # 2 decimal places
+        (1234.0, "1.234,00 kr"),       # .00 for whole numbers
+        (123456.78, "123.456,78 kr"),  # thousands separator
+        (0.50, "0,50 kr"),             # less than 1 kr
+        (0.00, "0,00 kr"),
+        (1000, "1.000,00 kr"),         # integer input
+        (1000000, "1.000.000,00 kr"),  # multiple thousands separators
+    ])
+    def test_format_currency(self, amount, expected):
+        """Should format amounts as Danish currency."""
+        assert format_currency(amount) == expected
+
+    @pytest.mark.parametrize("first", [0.0, -0.001])
+    def test_format_currency_negative_zero(self, first):
+        """Amounts rounding to zero should format the same regardless of cache order."""
+        api._format_currency.cache_clear()
+        format_currency(first)
+
+        assert format_currency(-0.001) == "0,00 kr"
+        assert format_currency(-0.0) == "0,00 kr"
+        assert format_currency(0.0) == "0,00 kr"